@@ -0,0 +1,413 @@
+"""Read-only analytics over the bot's SQLite history.
+
+Rows are streamed from SQLite cursors in batches and paginated with keyset
+cursors, so memory use stays flat regardless of database size. The same API is
+exposed over a local HTTP server:
+
+    python analytics.py --port 8600
+
+    GET /scans?start=2024-01-01&strength=STRONG&format=csv
+    GET /trades?symbol=BONK&reason=STOP%20LOSS&limit=100&cursor=...
+
+Feed responses carry the next page's cursor in the ``X-Next-Cursor`` header
+(and in the JSON body); it is empty on the last page.
+    GET /stats/score-buckets?bucket=10
+    GET /stats/hourly-scans?start=2024-01-01T00:00:00
+"""
+import argparse
+import base64
+import csv
+import io
+import itertools
+import json
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Feed name -> (table, time column, filterable columns)
+FEEDS = {
+    'scans': ('scanned_tokens', 'scanned_at', ('strength', 'symbol')),
+    'trades': ('trades', 'exit_time', ('symbol', 'reason')),
+}
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 10000
+FETCH_BATCH = 500
+
+# Column types of the aggregation results, for typed Arrow output
+SCORE_BUCKET_COLUMNS = [
+    ('bucket', 'INTEGER'), ('scans', 'INTEGER'), ('trades', 'INTEGER'),
+    ('wins', 'INTEGER'), ('pnl', 'REAL'), ('hit_rate', 'REAL'),
+]
+HOURLY_SCAN_COLUMNS = [
+    ('hour', 'TEXT'), ('scans', 'INTEGER'), ('strong', 'INTEGER'),
+    ('medium', 'INTEGER'), ('weak', 'INTEGER'),
+]
+
+
+def encode_cursor(time_value, rowid):
+    raw = json.dumps([time_value, rowid]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(value, list) or len(value) != 2:
+            raise ValueError
+        time_value, rowid = value
+        # Feeds never page over NULL times, a cursor carrying one is forged
+        if not isinstance(time_value, str) or isinstance(rowid, bool):
+            raise ValueError
+        rowid = int(rowid)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return time_value, rowid
+
+
+class AnalyticsAPI:
+    def __init__(self, db_file="trading_bot.db"):
+        self.db_file = db_file
+
+    def get_connection(self):
+        # Opened read-only so the API can never modify the bot's state
+        conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _where(self, feed, start=None, end=None, after=None, **filters):
+        """Returns (table, time column, WHERE clause, params) for a feed query."""
+        if feed not in FEEDS:
+            raise ValueError(f"Unknown feed: {feed}")
+        table, time_col, filterable = FEEDS[feed]
+
+        # Rows without a time can't be ordered for keyset pagination
+        clauses, params = [f"{time_col} IS NOT NULL"], []
+        if start:
+            clauses.append(f"{time_col} >= ?")
+            params.append(start)
+        if end:
+            clauses.append(f"{time_col} < ?")
+            params.append(end)
+        for key, value in filters.items():
+            if key not in filterable:
+                raise ValueError(f"Cannot filter {feed} by {key}")
+            if value is not None:
+                clauses.append(f"{key} = ?")
+                params.append(value)
+        if after:
+            clauses.append(f"({time_col}, rowid) > (?, ?)")
+            params.extend(decode_cursor(after))
+        return table, time_col, " WHERE " + " AND ".join(clauses), params
+
+    def table_columns(self, table):
+        """Returns [(name, declared type), ...] for a table, in SELECT * order."""
+        conn = self.get_connection()
+        columns = [(row['name'], row['type']) for row in conn.execute(f"PRAGMA table_info({table})")]
+        conn.close()
+        return columns
+
+    def iter_page(self, feed, limit=DEFAULT_PAGE_SIZE, cursor=None, start=None, end=None, **filters):
+        """Returns a lazily streamed page of up to ``limit`` rows.
+
+        ``next_cursor`` is known up front (None on the last page), so it can be
+        sent before the rows are streamed.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        table, time_col, where, params = self._where(feed, start, end, cursor, **filters)
+
+        # Keyset probe: the page's last key, and whether any row follows it
+        conn = self.get_connection()
+        probe = conn.execute(
+            f"SELECT {time_col}, rowid FROM {table}{where} ORDER BY {time_col}, rowid LIMIT 2 OFFSET ?",
+            params + [limit - 1]
+        ).fetchall()
+        conn.close()
+
+        next_cursor = None
+        if len(probe) == 2:
+            next_cursor = encode_cursor(*probe[0])
+            # Bound the page by the cursor so rows inserted meanwhile can't shift it
+            where += f" AND ({time_col}, rowid) <= (?, ?)"
+            params = params + list(probe[0])
+
+        sql = f"SELECT rowid AS _rowid, * FROM {table}{where} ORDER BY {time_col}, rowid LIMIT ?"
+        return Page(self, sql, params + [limit], self.table_columns(table), next_cursor)
+
+    def page(self, feed, limit=DEFAULT_PAGE_SIZE, cursor=None, start=None, end=None, **filters):
+        """Returns one page as ``{'rows': [...], 'next_cursor': ...}``."""
+        page = self.iter_page(feed, limit, cursor, start, end, **filters)
+        rows = list(page)
+        return {'rows': rows, 'next_cursor': page.next_cursor}
+
+    # --- Aggregations ---
+    def score_buckets(self, bucket=10, start=None, end=None):
+        """Scans, trades and winning trades per score bucket."""
+        bucket = max(1, int(bucket))
+        clauses, params = [], [bucket, bucket]
+        if start:
+            clauses.append("s.scanned_at >= ?")
+            params.append(start)
+        if end:
+            clauses.append("s.scanned_at < ?")
+            params.append(end)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+
+        conn = self.get_connection()
+        rows = conn.execute(f'''
+            SELECT (MAX(s.score, 0) / ?) * ? AS bucket,
+                   COUNT(DISTINCT s.address) AS scans,
+                   COUNT(t.id) AS trades,
+                   COALESCE(SUM(t.pnl > 0), 0) AS wins,
+                   COALESCE(SUM(t.pnl), 0.0) AS pnl
+            FROM scanned_tokens s
+            LEFT JOIN trades t ON t.address = s.address
+            {where}
+            GROUP BY bucket
+            ORDER BY bucket
+        ''', params).fetchall()
+        conn.close()
+
+        result = []
+        for row in rows:
+            d = dict(row)
+            d['hit_rate'] = d['wins'] / d['trades'] if d['trades'] else None
+            result.append(d)
+        return result
+
+    def hourly_scan_volume(self, start=None, end=None):
+        """Scan counts per hour, split by strength."""
+        clauses, params = [], []
+        if start:
+            clauses.append("scanned_at >= ?")
+            params.append(start)
+        if end:
+            clauses.append("scanned_at < ?")
+            params.append(end)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+
+        conn = self.get_connection()
+        rows = conn.execute(f'''
+            SELECT strftime('%Y-%m-%dT%H:00:00', scanned_at) AS hour,
+                   COUNT(*) AS scans,
+                   SUM(strength = 'STRONG') AS strong,
+                   SUM(strength = 'MEDIUM') AS medium,
+                   SUM(strength = 'WEAK') AS weak
+            FROM scanned_tokens
+            {where}
+            GROUP BY hour
+            ORDER BY hour
+        ''', params).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+
+class Page:
+    """One keyset-paginated page of a feed, streamed from the cursor on iteration."""
+
+    def __init__(self, api, sql, params, columns, next_cursor):
+        self.api = api
+        self.sql = sql
+        self.params = params
+        self.columns = columns
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        conn = self.api.get_connection()
+        try:
+            cursor = conn.execute(self.sql, self.params)
+            while True:
+                rows = cursor.fetchmany(FETCH_BATCH)
+                if not rows:
+                    break
+                for row in rows:
+                    d = dict(row)
+                    del d['_rowid']
+                    yield d
+        finally:
+            conn.close()
+
+
+# --- Serialization ---
+def write_json(rows, out, page=None):
+    """Writes rows as a JSON object one row at a time.
+
+    Pages (passed as ``rows`` or ``page``) also get their ``next_cursor``.
+    """
+    if isinstance(rows, Page):
+        page = rows
+    out.write(b'{"rows": [')
+    for i, row in enumerate(rows):
+        if i:
+            out.write(b', ')
+        out.write(json.dumps(row).encode())
+    out.write(b']')
+    if page is not None:
+        out.write(f', "next_cursor": {json.dumps(page.next_cursor)}'.encode())
+    out.write(b'}')
+
+
+def write_csv(rows, out, columns=None):
+    """Writes rows as CSV, flushing each row to ``out``.
+
+    ``columns`` is a list of (name, SQLite type); pages supply their own. The
+    header row is written even when there are no rows.
+    """
+    if columns is None:
+        columns = rows.columns
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=[name for name, _ in columns])
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        out.write(buf.getvalue().encode())
+        buf.seek(0)
+        buf.truncate()
+    out.write(buf.getvalue().encode())
+
+
+def arrow_schema(columns):
+    """Maps SQLite declared column types to an Arrow schema.
+
+    Typing from the declarations rather than the data keeps the schema stable
+    when the first batch happens to be all NULL in some column.
+    """
+    import pyarrow as pa  # Optional dependency, only needed for Arrow output
+
+    fields = []
+    for name, decl in columns:
+        decl = (decl or '').upper()
+        if 'INT' in decl:
+            arrow_type = pa.int64()
+        elif any(t in decl for t in ('REAL', 'FLOA', 'DOUB')):
+            arrow_type = pa.float64()
+        else:
+            # TEXT, and TIMESTAMP columns which this app stores as ISO strings
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def write_arrow(rows, out, columns=None, batch_size=FETCH_BATCH):
+    """Writes rows as an Arrow IPC stream, one record batch per ``batch_size`` rows.
+
+    ``columns`` is a list of (name, SQLite type); pages supply their own.
+    """
+    import pyarrow as pa
+
+    if columns is None:
+        columns = rows.columns
+    schema = arrow_schema(columns)
+    writer = pa.ipc.new_stream(out, schema)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            batch.clear()
+    if batch:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    writer.close()
+
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+
+# --- HTTP ---
+class AnalyticsHandler(BaseHTTPRequestHandler):
+    api = None
+    streaming = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        fmt = query.pop('format', 'json')
+        path = url.path.rstrip('/')
+        self.streaming = False
+
+        try:
+            if fmt not in CONTENT_TYPES:
+                raise ValueError(f"Unknown format: {fmt}")
+            if path == '/stats/score-buckets':
+                self.check_params(query, ('bucket', 'start', 'end'))
+                rows = self.api.score_buckets(query.get('bucket', 10), query.get('start'), query.get('end'))
+                self.send_rows(rows, fmt, SCORE_BUCKET_COLUMNS)
+            elif path == '/stats/hourly-scans':
+                self.check_params(query, ('start', 'end'))
+                rows = self.api.hourly_scan_volume(query.get('start'), query.get('end'))
+                self.send_rows(rows, fmt, HOURLY_SCAN_COLUMNS)
+            elif path.lstrip('/') in FEEDS:
+                feed = path.lstrip('/')
+                self.check_params(query, ('limit', 'cursor', 'start', 'end') + FEEDS[feed][2])
+                page = self.api.iter_page(feed, **query)
+                self.send_rows(page, fmt, page.columns)
+            else:
+                self.send_error(404, "Unknown endpoint")
+        except ValueError as e:
+            self.send_error(400, str(e))
+        except ImportError as e:
+            self.send_error(501, f"Format unavailable: {e}")
+        except sqlite3.Error as e:
+            if self.streaming:
+                # Headers are gone, all we can do is cut the response short
+                self.log_error("Stream aborted: %s", e)
+                self.close_connection = True
+            elif isinstance(e, sqlite3.OperationalError):
+                self.send_error(503, f"Database unavailable: {e}")
+            else:
+                self.send_error(500, f"Database error: {e}")
+
+    def check_params(self, query, allowed):
+        unknown = sorted(set(query) - set(allowed))
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(unknown)}")
+
+    def send_rows(self, rows, fmt, columns):
+        if fmt == 'arrow':
+            import pyarrow  # noqa: F401 -- fail with 501 before any headers are sent
+
+        # Pull the first row so the query runs, and can fail, before the headers
+        page = rows if isinstance(rows, Page) else None
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is not None:
+            rows = itertools.chain([first], rows)
+
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPES[fmt])
+        if page is not None:
+            # Lets CSV and Arrow clients page too; empty on the last page
+            self.send_header('X-Next-Cursor', page.next_cursor or '')
+        self.end_headers()
+        self.streaming = True
+        if fmt == 'json':
+            write_json(rows, self.wfile, page)
+        elif fmt == 'csv':
+            write_csv(rows, self.wfile, columns)
+        else:
+            write_arrow(rows, self.wfile, columns)
+
+
+def serve(db_file="trading_bot.db", host="127.0.0.1", port=8600):
+    handler = type('Handler', (AnalyticsHandler,), {'api': AnalyticsAPI(db_file)})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Analytics API on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only analytics API over the trading DB.")
+    parser.add_argument('--db', default="trading_bot.db")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args()
+    serve(args.db, args.host, args.port)
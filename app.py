@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import time
 from bot_logic import TradingBot
-import plotly.express as px
+from discovery import profile_signals
 from datetime import datetime
 
 # Page Config
@@ -92,6 +92,12 @@ with st.sidebar:
         bot.stop_loss = st.slider("Stop Loss (%)", -90, -5, int(bot.stop_loss*100)) / 100
         bot.min_liquidity = st.number_input("Min Liquidity ($)", 1000, 500000, bot.min_liquidity)
         bot.min_score = st.slider("Min Score (Strength)", 50, 100, bot.min_score)
+        bot.max_detail_requests = st.number_input("Lookups per Scan", 1, 100, bot.max_detail_requests)
+
+    with st.expander("Execution Model", expanded=False):
+        bot.executor.swap_fee = st.number_input("Swap Fee (%)", 0.0, 5.0, bot.executor.swap_fee*100, step=0.05) / 100
+        bot.executor.priority_fee = st.number_input("Priority Fee (SOL)", 0.0, 0.1, bot.executor.priority_fee, step=0.0001, format="%.4f")
+        bot.executor.latency_ms = st.number_input("Fill Latency (ms)", 0, 10000, bot.executor.latency_ms, step=100)
 
     with st.expander("Wallet Actions", expanded=False):
         deposit_amount = st.number_input("Deposit SOL", 0.0, 1000.0, 0.0)
@@ -112,13 +118,18 @@ with st.sidebar:
         st.session_state.scanner_running = False
         st.rerun()
 
+    ledger = bot.db.check_consistency()
+    if not ledger['ok']:
+        st.warning(f"Ledger out of balance by {ledger['drift']:.6f} SOL")
+
     status_color = "green" if st.session_state.scanner_running else "red"
     st.markdown(f"**Status:** <span style='color:{status_color}'>{'Running' if st.session_state.scanner_running else 'Stopped'}</span>", unsafe_allow_html=True)
 
 # --- SCANNING LOGIC ---
 if st.session_state.scanner_running:
     new_tokens = bot.fetch_new_tokens()
-    for token in new_tokens:
+    # Highest prior first; tokens past the request budget wait for the next batch
+    for token in bot.prioritize_tokens(new_tokens):
         addr = token['tokenAddress']
         if addr not in bot.seen_tokens:
             bot.seen_tokens.add(addr)
@@ -135,6 +146,7 @@ if st.session_state.scanner_running:
                     'liquidity': float(pair_data.get('liquidity', {}).get('usd', 0)),
                     'score': score,
                     'strength': strength,
+                    'signals': profile_signals(token),
                     'time': datetime.now().isoformat()
                 }
                 bot.db.log_scan(scan_data)
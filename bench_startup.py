@@ -0,0 +1,70 @@
+"""Cold-start import benchmark for the headless entry points.
+
+Runs each target in a fresh interpreter under ``python -X importtime`` and
+checks the cumulative import time against its budget.
+
+    python bench_startup.py            # report and fail on budget overrun
+    python bench_startup.py --runs 10  # take the best of 10 cold starts
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Target -> (statement, budget in milliseconds)
+TARGETS = {
+    'cli runner': ('import main', 100),
+    'TradingBot': ('from bot_logic import TradingBot', 100),
+}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(statement):
+    """Returns (total_ms, [(cumulative_us, module), ...]) for one cold start."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=HERE, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        # The error is the last line that isn't importtime output
+        errors = [l for l in proc.stderr.splitlines() if l.strip() and not l.startswith('import time:')]
+        raise RuntimeError(errors[-1] if errors else f"exit code {proc.returncode}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Only top-level imports count toward the total, nested ones are included in them
+        if not name[1:].startswith(' '):
+            modules.append((int(cumulative), name.strip()))
+    return sum(us for us, _ in modules) / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5, help='slowest imports to list')
+    args = parser.parse_args()
+
+    failed = False
+    for label, (statement, budget) in TARGETS.items():
+        try:
+            best, modules = min((measure(statement) for _ in range(args.runs)), key=lambda r: r[0])
+        except RuntimeError as e:
+            failed = True
+            print(f"{label:<12} FAILED  ({statement}: {e})")
+            continue
+        ok = best <= budget
+        failed |= not ok
+        print(f"{label:<12} {best:8.1f} ms  (budget {budget} ms)  {'OK' if ok else 'OVER'}")
+        for us, name in sorted(modules, reverse=True)[:args.top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
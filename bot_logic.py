@@ -1,8 +1,7 @@
-import requests
-import pandas as pd
-import time
 from datetime import datetime
 from database import Database
+from execution import ExecutionSimulator
+from discovery import DiscoveryQueue
 
 class TradingBot:
     def __init__(self):
@@ -17,6 +16,13 @@ class TradingBot:
         self.stop_loss = -0.10
         self.trade_amount = 0.5
         self.min_score = 70
+        self.max_detail_requests = 25 # Pair lookups per discovery batch
+
+        # Fill model (slippage, price impact, fees, latency)
+        self.executor = ExecutionSimulator()
+
+        # Orders new tokens by how likely they are to score well
+        self.discovery = DiscoveryQueue(self.db)
 
     @property
     def balance(self):
@@ -31,10 +37,11 @@ class TradingBot:
         return self.db.get_history()
 
     def deposit_sol(self, amount):
-        self.db.update_balance(amount)
+        self.db.deposit(amount)
 
     def fetch_new_tokens(self):
         """Fetches latest token profiles."""
+        import requests  # Deferred: only network paths pay the import cost
         try:
             response = requests.get(self.api_url, timeout=5)
             if response.status_code == 200:
@@ -44,8 +51,14 @@ class TradingBot:
             print(f"Error fetching tokens: {e}")
         return []
 
+    def prioritize_tokens(self, tokens):
+        """Returns unseen tokens, best prior first, trimmed to the request budget."""
+        unseen = [t for t in tokens if t['tokenAddress'] not in self.seen_tokens]
+        return self.discovery.rank(unseen, self.max_detail_requests)
+
     def get_token_details(self, token_address):
         """Fetches detailed pair info for a token."""
+        import requests
         try:
             url = f"{self.dex_url}/{token_address}"
             response = requests.get(url, timeout=5)
@@ -120,26 +133,24 @@ class TradingBot:
         if address in current_positions:
             return False
 
-        price = float(pair_data['priceNative'])
         symbol = pair_data['baseToken']['symbol']
+        amount_tokens, cost = self.executor.simulate_buy(pair_data, self.trade_amount)
         current_balance = self.balance
         
-        if current_balance >= self.trade_amount:
-            # Deduct Balance
-            self.db.update_balance(-self.trade_amount)
-            
-            amount_tokens = self.trade_amount / price
+        if amount_tokens > 0 and current_balance >= cost:
+            # Effective entry price includes impact and fees
+            price = cost / amount_tokens
             
             position = {
                 'address': address,
                 'symbol': symbol,
                 'entry_price': price,
                 'amount': amount_tokens,
-                'current_price': price,
+                'current_price': float(pair_data['priceNative']),
                 'entry_time': datetime.now().isoformat()
             }
-            self.db.add_position(position)
-            return True
+            # Balance debit and position insert are journaled as one action
+            return self.db.open_position(position, cost)
         return False
 
     def update_positions(self):
@@ -150,8 +161,8 @@ class TradingBot:
             if pair:
                 current_price = float(pair['priceNative'])
                 
-                # Calculate PnL
-                value_now = pos['quantity'] * current_price
+                # Calculate PnL against what a sell would actually return
+                value_now = self.executor.simulate_sell(pair, pos['quantity'])
                 value_entry = pos['quantity'] * pos['avg_entry_price']
                 pnl = value_now - value_entry
                 pnl_pct = (pnl / value_entry)
@@ -167,15 +178,12 @@ class TradingBot:
                     reason = "STOP LOSS"
                 
                 if reason:
-                    # Add back to balance
-                    self.db.update_balance(value_now)
-                    
                     # Log Trade
                     trade_data = {
                         'symbol': pos['symbol'],
                         'address': pos['address'],
                         'entry_price': pos['avg_entry_price'],
-                        'exit_price': current_price,
+                        'exit_price': value_now / pos['quantity'],
                         'amount': pos['quantity'],
                         'pnl': pnl,
                         'pnl_pct': pnl_pct * 100,
@@ -183,6 +191,6 @@ class TradingBot:
                         'entry_time': pos['entry_time'],
                         'exit_time': datetime.now().isoformat()
                     }
-                    self.db.add_trade_history(trade_data)
-                    self.db.remove_position(pos['address'])
+                    # Balance credit, trade log and position removal are journaled as one action
+                    self.db.close_position(trade_data, value_now)
 
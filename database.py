@@ -8,10 +8,14 @@ class Database:
         self.init_db()
 
     def get_connection(self):
-        return sqlite3.connect(self.db_file)
+        conn = sqlite3.connect(self.db_file)
+        # Safe in WAL mode: a crash can only lose the last commits, never corrupt
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
 
     def init_db(self):
         conn = self.get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         
         # Settings & Balance
@@ -38,6 +42,12 @@ class Database:
             )
         ''')
         
+        # Profile signal bitmask (added after release, migrate older DBs).
+        # No default: older scans stay NULL as their signals were never recorded.
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(scanned_tokens)")]
+        if 'signals' not in columns:
+            cursor.execute("ALTER TABLE scanned_tokens ADD COLUMN signals INTEGER")
+        
         # Active Positions
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS positions (
@@ -69,8 +79,35 @@ class Database:
             )
         ''')
         
+        # Write-ahead journal of trade actions, replayed on startup
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                action TEXT,
+                payload TEXT,
+                status TEXT DEFAULT 'PENDING',
+                created_at TIMESTAMP
+            )
+        ''')
+        
+        # Reconciliation baseline. Older DBs get the starting balance that makes
+        # their current state reconcile, with past deposits folded into it.
+        if not cursor.execute("SELECT 1 FROM settings WHERE key='initial_balance'").fetchone():
+            balance = float(cursor.execute("SELECT value FROM settings WHERE key='balance'").fetchone()[0])
+            cost_basis = cursor.execute("SELECT COALESCE(SUM(quantity * avg_entry_price), 0) FROM positions").fetchone()[0]
+            realized = cursor.execute("SELECT COALESCE(SUM(pnl), 0) FROM trades").fetchone()[0]
+            cursor.execute("INSERT INTO settings (key, value) VALUES ('initial_balance', ?)", (str(balance + cost_basis - realized),))
+        cursor.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('deposits', '0.0')")
+        
+        # Time-range indexes for the analytics feeds
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_tokens_scanned_at ON scanned_tokens (scanned_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_exit_time ON trades (exit_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_address ON trades (address)")
+        
         conn.commit()
         conn.close()
+        
+        self.replay_journal()
 
     # --- Balance Methods ---
     def get_balance(self):
@@ -79,19 +116,18 @@ class Database:
         conn.close()
         return float(val[0]) if val else 0.0
 
-    def update_balance(self, amount):
-        """Adds (or subtracts) amount from current balance."""
-        current = self.get_balance()
-        new_bal = current + amount
-        conn = self.get_connection()
-        conn.execute("UPDATE settings SET value=? WHERE key='balance'", (str(new_bal),))
-        conn.commit()
-        conn.close()
-        return new_bal
+    def _add_setting(self, conn, key, amount):
+        # Caller holds the write lock (BEGIN IMMEDIATE), so read-modify-write is safe.
+        # Formatted in Python: SQLite's REAL to TEXT cast keeps only 15 digits.
+        current = conn.execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()[0]
+        conn.execute("UPDATE settings SET value=? WHERE key=?", (str(float(current) + amount), key))
+
+    def deposit(self, amount):
+        """Credits a deposit, tracked separately so the balance can be reconciled."""
+        return self.execute_action('DEPOSIT', {'amount': amount})
 
     # --- Position Methods ---
-    def add_position(self, pos_data):
-        conn = self.get_connection()
+    def _add_position(self, conn, pos_data):
         conn.execute('''
             INSERT INTO positions (address, symbol, avg_entry_price, quantity, current_price, pnl, pnl_pct, entry_time)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
@@ -99,8 +135,6 @@ class Database:
             pos_data['address'], pos_data['symbol'], pos_data['entry_price'], 
             pos_data['amount'], pos_data['current_price'], 0.0, 0.0, pos_data['entry_time']
         ))
-        conn.commit()
-        conn.close()
 
     def get_positions(self):
         conn = self.get_connection()
@@ -109,11 +143,9 @@ class Database:
         conn.close()
         return [dict(row) for row in rows]
 
-    def remove_position(self, address):
-        conn = self.get_connection()
-        conn.execute("DELETE FROM positions WHERE address=?", (address,))
-        conn.commit()
-        conn.close()
+    def _remove_position(self, conn, address):
+        """Returns True if a position was removed."""
+        return conn.execute("DELETE FROM positions WHERE address=?", (address,)).rowcount > 0
         
     def update_position_stats(self, address, current_price, pnl, pnl_pct):
         conn = self.get_connection()
@@ -126,8 +158,7 @@ class Database:
         conn.close()
 
     # --- History Methods ---
-    def add_trade_history(self, trade_data):
-        conn = self.get_connection()
+    def _add_trade_history(self, conn, trade_data):
         conn.execute('''
             INSERT INTO trades (symbol, address, entry_price, exit_price, quantity, pnl, pnl_pct, reason, entry_time, exit_time)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -136,8 +167,6 @@ class Database:
             trade_data['exit_price'], trade_data['amount'], trade_data['pnl'],
             trade_data['pnl_pct'], trade_data['reason'], trade_data['entry_time'], trade_data['exit_time']
         ))
-        conn.commit()
-        conn.close()
 
     def get_history(self):
         conn = self.get_connection()
@@ -152,12 +181,12 @@ class Database:
         # or we could insert all. For a feed, 'INSERT OR REPLACE' acts like an update.
         conn = self.get_connection()
         conn.execute('''
-            INSERT OR REPLACE INTO scanned_tokens (address, symbol, icon, liquidity, score, strength, scanned_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT OR REPLACE INTO scanned_tokens (address, symbol, icon, liquidity, score, strength, scanned_at, signals)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             token_data['address'], token_data['symbol'], token_data['icon'],
             token_data['liquidity'], token_data['score'], token_data['strength'],
-            token_data['time']
+            token_data['time'], token_data.get('signals')
         ))
         conn.commit()
         conn.close()
@@ -174,3 +203,139 @@ class Database:
             d['time'] = d['scanned_at'] # alias for UI
             result.append(d)
         return result
+
+    def get_signal_stats(self):
+        """Returns (signals, total, strong) scan counts per profile signal bitmask."""
+        conn = self.get_connection()
+        rows = conn.execute('''
+            SELECT signals, COUNT(*), SUM(strength = 'STRONG')
+            FROM scanned_tokens
+            WHERE signals IS NOT NULL
+            GROUP BY signals
+        ''').fetchall()
+        conn.close()
+        return rows
+
+    # --- Journal Methods ---
+    def execute_action(self, action, payload):
+        """Journals a trade action, then applies it atomically.
+
+        Older entries still pending (a crash, or a lock error in this process)
+        are applied first, in order, so they never wait for a restart. Returns
+        True once this action is applied; if it stays PENDING behind a lock it
+        is applied by the next action or on startup.
+        """
+        conn = self.get_connection()
+        cursor = conn.execute(
+            "INSERT INTO journal (action, payload, created_at) VALUES (?, ?, ?)",
+            (action, json.dumps(payload), datetime.now().isoformat())
+        )
+        conn.commit()
+        entry_id = cursor.lastrowid
+        conn.close()
+
+        self.replay_journal()
+
+        conn = self.get_connection()
+        status = conn.execute("SELECT status FROM journal WHERE id=?", (entry_id,)).fetchone()[0]
+        conn.close()
+        return status == 'DONE'
+
+    def apply_action(self, entry_id):
+        """Applies a pending journal entry. Returns False if it was already applied or failed.
+
+        An entry that can't be applied is marked FAILED so replay never gets
+        stuck on it; only transient lock errors are raised, leaving it PENDING.
+        """
+        conn = self.get_connection()
+        try:
+            try:
+                # Take the write lock up front so balance updates can't interleave
+                conn.execute("BEGIN IMMEDIATE")
+                # Claiming the entry in the same transaction makes replay idempotent
+                claimed = conn.execute(
+                    "UPDATE journal SET status='DONE' WHERE id=? AND status='PENDING'", (entry_id,)
+                ).rowcount
+                if not claimed:
+                    conn.rollback()
+                    return False
+                action, payload = conn.execute("SELECT action, payload FROM journal WHERE id=?", (entry_id,)).fetchone()
+                self._apply(conn, action, json.loads(payload))
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                if self._is_transient(e):
+                    raise
+                print(f"Journal entry {entry_id} failed: {e!r}")
+            with conn:
+                conn.execute("UPDATE journal SET status='FAILED' WHERE id=?", (entry_id,))
+            return False
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _is_transient(error):
+        return isinstance(error, sqlite3.OperationalError) and ('locked' in str(error) or 'busy' in str(error))
+
+    def _apply(self, conn, action, payload):
+        if action == 'DEPOSIT':
+            self._add_setting(conn, 'balance', payload['amount'])
+            self._add_setting(conn, 'deposits', payload['amount'])
+        elif action == 'ENTER':
+            self._add_setting(conn, 'balance', -payload['cost'])
+            self._add_position(conn, payload['position'])
+        elif action == 'EXIT':
+            trade_data = payload['trade']
+            if not self._remove_position(conn, trade_data['address']):
+                raise ValueError(f"No open position for {trade_data['address']}")
+            self._add_setting(conn, 'balance', payload['proceeds'])
+            self._add_trade_history(conn, trade_data)
+        else:
+            raise ValueError(f"Unknown journal action: {action}")
+
+    def open_position(self, pos_data, cost):
+        """Debits cost and opens the position as one journaled action."""
+        return self.execute_action('ENTER', {'position': pos_data, 'cost': cost})
+
+    def close_position(self, trade_data, proceeds):
+        """Credits proceeds, logs the trade and removes the position as one journaled action."""
+        return self.execute_action('EXIT', {'trade': trade_data, 'proceeds': proceeds})
+
+    def replay_journal(self):
+        """Applies journal entries left pending by a crash. Returns how many were applied."""
+        conn = self.get_connection()
+        pending = [row[0] for row in conn.execute("SELECT id FROM journal WHERE status='PENDING' ORDER BY id")]
+        conn.close()
+        applied = 0
+        for entry_id in pending:
+            try:
+                applied += self.apply_action(entry_id)
+            except sqlite3.OperationalError as e:
+                # Locked by another process: keep the rest, in order, for the next startup
+                print(f"Journal replay paused at entry {entry_id}: {e}")
+                break
+        return applied
+
+    def check_consistency(self, tolerance=1e-6):
+        """Checks balance + position cost basis == initial balance + deposits + realized PnL."""
+        conn = self.get_connection()
+        balance, initial, deposits, cost_basis, realized = conn.execute('''
+            SELECT
+                (SELECT CAST(value AS REAL) FROM settings WHERE key='balance'),
+                (SELECT CAST(value AS REAL) FROM settings WHERE key='initial_balance'),
+                (SELECT CAST(value AS REAL) FROM settings WHERE key='deposits'),
+                (SELECT COALESCE(SUM(quantity * avg_entry_price), 0) FROM positions),
+                (SELECT COALESCE(SUM(pnl), 0) FROM trades)
+        ''').fetchone()
+        conn.close()
+        drift = (balance + cost_basis) - (initial + deposits + realized)
+        return {
+            'balance': balance,
+            'cost_basis': cost_basis,
+            'initial_balance': initial,
+            'deposits': deposits,
+            'realized_pnl': realized,
+            'drift': drift,
+            'ok': abs(drift) <= tolerance
+        }
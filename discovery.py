@@ -0,0 +1,88 @@
+import heapq
+import time
+
+# Cheap signals read straight from the token profile payload, stored as a bitmask
+SIGNAL_ICON = 1
+SIGNAL_HEADER = 2
+SIGNAL_DESCRIPTION = 4
+SIGNAL_WEBSITE = 8
+SIGNAL_SOCIAL = 16
+
+# Hand-tuned contribution of each signal to the prior before any history exists
+SIGNAL_WEIGHTS = {
+    SIGNAL_ICON: 0.05,
+    SIGNAL_HEADER: 0.10,
+    SIGNAL_DESCRIPTION: 0.10,
+    SIGNAL_WEBSITE: 0.15,
+    SIGNAL_SOCIAL: 0.15,
+}
+BASE_PRIOR = 0.05
+
+
+def profile_signals(token):
+    """Encodes the presence of profile signals as a bitmask."""
+    signals = 0
+    if token.get('icon'):
+        signals |= SIGNAL_ICON
+    if token.get('header'):
+        signals |= SIGNAL_HEADER
+    if token.get('description'):
+        signals |= SIGNAL_DESCRIPTION
+    for link in token.get('links') or ():
+        if link.get('type'):
+            signals |= SIGNAL_SOCIAL
+        else:
+            # DexScreener marks websites with a label instead of a type
+            signals |= SIGNAL_WEBSITE
+    return signals
+
+
+def heuristic_prior(signals):
+    """Prior probability that a token scores STRONG, from signals alone."""
+    prior = BASE_PRIOR
+    for bit, weight in SIGNAL_WEIGHTS.items():
+        if signals & bit:
+            prior += weight
+    return prior
+
+
+class DiscoveryQueue:
+    """Orders newly discovered tokens so the most promising get pair details first.
+
+    The heuristic prior of each signal combination is blended with the observed
+    STRONG rate of past scans that had the same combination, weighted by
+    ``prior_strength`` pseudo-observations. The learned priors come from a
+    GROUP BY over every past scan, so they are cached for ``refresh_interval``
+    seconds rather than recomputed for each batch.
+    """
+
+    def __init__(self, db, prior_strength=10, refresh_interval=300):
+        self.db = db
+        self.prior_strength = prior_strength
+        self.refresh_interval = refresh_interval
+        self.priors = {}
+        self.refreshed_at = None
+
+    def refresh_priors(self):
+        """Reloads the learned priors from past scan outcomes."""
+        a = self.prior_strength
+        self.priors = {
+            signals: (strong + a * heuristic_prior(signals)) / (total + a)
+            for signals, total, strong in self.db.get_signal_stats()
+        }
+        self.refreshed_at = time.monotonic()
+
+    def prior(self, signals):
+        learned = self.priors.get(signals)
+        return learned if learned is not None else heuristic_prior(signals)
+
+    def rank(self, tokens, budget=None):
+        """Returns tokens ordered by prior, keeping only the top ``budget``."""
+        if self.refreshed_at is None or time.monotonic() - self.refreshed_at >= self.refresh_interval:
+            self.refresh_priors()
+        scored = [(-self.prior(profile_signals(t)), i, t) for i, t in enumerate(tokens)]
+        if budget is None or budget >= len(scored):
+            scored.sort()
+        else:
+            scored = heapq.nsmallest(budget, scored)
+        return [t for _, _, t in scored]
@@ -0,0 +1,69 @@
+class ExecutionSimulator:
+    """Closed-form fill model for paper trades against a constant-product AMM.
+
+    Fills are derived from the DexScreener pair payload: ``priceNative`` is the
+    spot price (quote per base token) and ``liquidity.base`` / ``liquidity.quote``
+    are the pool reserves. Every method works on plain floats so it can run on
+    every simulated trade in backtests without allocating intermediate objects.
+    """
+
+    __slots__ = ('swap_fee', 'priority_fee', 'latency_ms')
+
+    def __init__(self, swap_fee=0.0025, priority_fee=0.0001, latency_ms=400):
+        self.swap_fee = swap_fee          # Pool fee, fraction of the input amount
+        self.priority_fee = priority_fee  # Flat fee per swap, in quote (SOL)
+        self.latency_ms = latency_ms      # Delay between signal and landed swap
+
+    @staticmethod
+    def reserves(pair_data):
+        """Returns (base_reserve, quote_reserve), or (0.0, 0.0) if unknown."""
+        liq = pair_data.get('liquidity') or {}
+        base = float(liq.get('base') or 0)
+        quote = float(liq.get('quote') or 0)
+        if base > 0 and quote > 0:
+            return base, quote
+
+        # Fall back to splitting USD liquidity evenly across both sides
+        usd = float(liq.get('usd') or 0)
+        price_usd = float(pair_data.get('priceUsd') or 0)
+        price = float(pair_data.get('priceNative') or 0)
+        if usd > 0 and price_usd > 0 and price > 0:
+            base = usd * 0.5 / price_usd
+            return base, base * price
+        return 0.0, 0.0
+
+    def fill_price(self, pair_data):
+        """Spot price after drifting along the 5m trend for the fill latency."""
+        price = float(pair_data['priceNative'])
+        if self.latency_ms <= 0:
+            return price
+        change_m5 = float((pair_data.get('priceChange') or {}).get('m5') or 0)
+        drift = change_m5 / 100 * (self.latency_ms / 300000)
+        return price * max(1 + drift, 0.0)
+
+    def simulate_buy(self, pair_data, amount_in):
+        """Swaps ``amount_in`` SOL for tokens.
+
+        Returns (tokens_out, cost) where cost is the SOL debited including the
+        priority fee, so ``cost / tokens_out`` is the effective entry price.
+        """
+        price = self.fill_price(pair_data)
+        if price <= 0 or amount_in <= 0:
+            return 0.0, 0.0
+        _, quote = self.reserves(pair_data)
+        net_in = amount_in * (1 - self.swap_fee)
+        impact = 1 + net_in / quote if quote > 0 else 1.0
+        return net_in / (price * impact), amount_in + self.priority_fee
+
+    def simulate_sell(self, pair_data, tokens_in):
+        """Swaps ``tokens_in`` tokens back to SOL.
+
+        Returns the SOL credited after price impact, swap fee and priority fee.
+        """
+        price = self.fill_price(pair_data)
+        if price <= 0 or tokens_in <= 0:
+            return 0.0
+        base, _ = self.reserves(pair_data)
+        net_in = tokens_in * (1 - self.swap_fee)
+        impact = 1 + net_in / base if base > 0 else 1.0
+        return max(price * net_in / impact - self.priority_fee, 0.0)
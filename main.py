@@ -1,12 +1,5 @@
 import time
-import requests
-import json
-import os
-from datetime import datetime
-from colorama import init, Fore, Style
-
-# Initialize colorama
-init(autoreset=True)
+from colorama import init, Fore
 
 # Configuration
 DEXSCREENER_API_URL = "https://api.dexscreener.com/latest/dex"
@@ -79,6 +72,7 @@ class PaperTrader:
         return False
 
 def fetch_new_tokens():
+    import requests  # Deferred until the first network call
     try:
         response = requests.get(TOKEN_PROFILES_URL, timeout=10)
         if response.status_code == 200:
@@ -88,6 +82,7 @@ def fetch_new_tokens():
     return []
 
 def get_token_pair(token_address):
+    import requests
     url = f"{DEXSCREENER_API_URL}/tokens/{token_address}"
     try:
         response = requests.get(url, timeout=10)
@@ -104,6 +99,9 @@ def get_token_pair(token_address):
     return None
 
 def main():
+    # Initialize colorama
+    init(autoreset=True)
+
     trader = PaperTrader(INITIAL_BALANCE_SOL)
     print(f"{Fore.CYAN}Starting DexScreener Solana Paper Trading Bot...")
     print(f"{Fore.CYAN}Initial Balance: {trader.balance} SOL")
@@ -0,0 +1,205 @@
+import base64
+import csv
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from analytics import (
+    AnalyticsAPI, AnalyticsHandler, decode_cursor, encode_cursor, write_csv, write_json,
+)
+from database import Database
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "trading_bot.db")
+    db = Database(path)
+    # 48 scans, one every 30 minutes, alternating STRONG/WEAK, scores 0..95
+    for i in range(48):
+        db.log_scan({
+            'address': f'addr{i:02d}',
+            'symbol': 'EVEN' if i % 2 == 0 else 'ODD',
+            'icon': None,
+            'liquidity': 1000.0 + i,
+            'score': (i * 5) % 100,
+            'strength': 'STRONG' if i % 2 == 0 else 'WEAK',
+            'time': f'2024-01-01T{i // 2:02d}:{(i % 2) * 30:02d}:00',
+            'signals': 0,
+        })
+    db.open_position({
+        'address': 'addr10', 'symbol': 'EVEN', 'entry_price': 0.001, 'amount': 500.0,
+        'current_price': 0.001, 'entry_time': '2024-01-01T05:00:00',
+    }, 0.5)
+    db.close_position({
+        'symbol': 'EVEN', 'address': 'addr10', 'entry_price': 0.001, 'exit_price': 0.0012,
+        'amount': 500.0, 'pnl': 0.1, 'pnl_pct': 20.0, 'reason': 'TAKE PROFIT',
+        'entry_time': '2024-01-01T05:00:00', 'exit_time': '2024-01-01T06:00:00',
+    }, 0.6)
+    return path
+
+
+@pytest.fixture
+def api(db_file):
+    return AnalyticsAPI(db_file)
+
+
+@pytest.fixture
+def server(api):
+    handler = type('Handler', (AnalyticsHandler,), {'api': api, 'log_message': lambda *args: None})
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.headers, response.read()
+
+
+def test_keyset_pages_with_time_range_and_filter(api):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = api.page('scans', limit=5, cursor=cursor, start='2024-01-01T04:00:00',
+                        end='2024-01-01T16:00:00', strength='STRONG')
+        seen.extend(row['address'] for row in page['rows'])
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    # Hours 04..15 hold scans 8..31, the even ones are STRONG
+    assert seen == [f'addr{i:02d}' for i in range(8, 32, 2)]
+    assert pages == 3
+    assert '_rowid' not in api.page('scans', limit=1)['rows'][0]
+
+
+def test_symbol_filter_and_exact_last_page(api):
+    page = api.page('scans', limit=24, symbol='ODD')
+    assert len(page['rows']) == 24
+    # Exactly one page of results: no cursor to an empty page
+    assert page['next_cursor'] is None
+    assert {row['symbol'] for row in page['rows']} == {'ODD'}
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor('2024-01-01T00:00:00', 7)) == ('2024-01-01T00:00:00', 7)
+
+
+@pytest.mark.parametrize('cursor', [
+    'zzz',
+    base64.urlsafe_b64encode(b'[1,[1]]').decode(),
+    base64.urlsafe_b64encode(b'{"a": 1, "b": 2}').decode(),
+    base64.urlsafe_b64encode(b'[null, 3]').decode(),
+    base64.urlsafe_b64encode(b'["2024", 1, 2]').decode(),
+])
+def test_bad_cursors_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_score_buckets(api):
+    buckets = {row['bucket']: row for row in api.score_buckets(bucket=50)}
+    # Scores 0..95 in steps of 5, twice over 48 scans (the last 8 wrap around)
+    assert buckets[0]['scans'] == 28
+    assert buckets[50]['scans'] == 20
+    # addr10 scored 50 and closed one winning trade
+    assert buckets[50]['trades'] == 1
+    assert buckets[50]['hit_rate'] == 1.0
+    assert buckets[0]['hit_rate'] is None
+
+
+def test_hourly_scan_volume(api):
+    hours = api.hourly_scan_volume(start='2024-01-01T10:00:00', end='2024-01-01T12:00:00')
+    assert hours == [
+        {'hour': '2024-01-01T10:00:00', 'scans': 2, 'strong': 1, 'medium': 0, 'weak': 1},
+        {'hour': '2024-01-01T11:00:00', 'scans': 2, 'strong': 1, 'medium': 0, 'weak': 1},
+    ]
+
+
+def test_write_json_and_csv(api):
+    out = io.BytesIO()
+    write_json(api.iter_page('scans', limit=2), out)
+    body = json.loads(out.getvalue())
+    assert [row['address'] for row in body['rows']] == ['addr00', 'addr01']
+    assert decode_cursor(body['next_cursor'])[0] == '2024-01-01T00:30:00'
+
+    out = io.BytesIO()
+    write_csv(api.iter_page('scans', limit=2), out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue().decode())))
+    assert [row['address'] for row in rows] == ['addr00', 'addr01']
+
+    # No rows still yields the header
+    out = io.BytesIO()
+    write_csv(api.iter_page('scans', symbol='NONE'), out)
+    assert out.getvalue().decode().splitlines()[0].startswith('address,symbol,')
+
+
+def test_http_csv_paginates_with_header(server):
+    seen, cursor = [], ''
+    while True:
+        headers, body = get(f"{server}/scans?format=csv&limit=20&cursor={cursor}" if cursor else f"{server}/scans?format=csv&limit=20")
+        seen.extend(row['address'] for row in csv.DictReader(io.StringIO(body.decode())))
+        cursor = headers['X-Next-Cursor']
+        if not cursor:
+            break
+    assert seen == [f'addr{i:02d}' for i in range(48)]
+
+
+def test_http_json_trades(server):
+    headers, body = get(f"{server}/trades?reason=TAKE%20PROFIT")
+    assert headers['X-Next-Cursor'] == ''
+    assert [row['address'] for row in json.loads(body)['rows']] == ['addr10']
+
+
+@pytest.mark.parametrize('query', [
+    'scans?cursor=zzz',
+    'scans?cursor=' + base64.urlsafe_b64encode(b'[1,[1]]').decode(),
+    'scans?feed=trades',
+    'scans?reason=STOP',
+    'trades?limit=abc',
+    'stats/hourly-scans?bucket=5',
+    'scans?format=xml',
+])
+def test_http_bad_request(server, query):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(f"{server}/{query}")
+    assert excinfo.value.code == 400
+
+
+def test_http_missing_database(tmp_path):
+    api = AnalyticsAPI(str(tmp_path / "missing.db"))
+    handler = type('Handler', (AnalyticsHandler,), {'api': api, 'log_message': lambda *args: None})
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        for path in ('scans', 'stats/score-buckets'):
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                get(f"http://127.0.0.1:{httpd.server_address[1]}/{path}")
+            assert excinfo.value.code == 503
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_read_only_against_wal_database(db_file, api):
+    conn = api.get_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        # Sees writes the bot commits while a reader is open
+        conn.execute("SELECT COUNT(*) FROM scanned_tokens").fetchone()
+        Database(db_file).log_scan({
+            'address': 'late', 'symbol': 'LATE', 'icon': None, 'liquidity': 1.0, 'score': 0,
+            'strength': 'WEAK', 'time': '2024-01-02T00:00:00', 'signals': 0,
+        })
+        assert api.page('scans', symbol='LATE')['rows'][0]['address'] == 'late'
+        with pytest.raises(Exception, match='readonly'):
+            conn.execute("DELETE FROM trades")
+    finally:
+        conn.close()
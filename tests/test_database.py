@@ -0,0 +1,186 @@
+import json
+import sqlite3
+
+import pytest
+
+from bot_logic import TradingBot
+from database import Database
+
+
+def make_position(address='TOKEN', price=0.001, amount=500.0):
+    return {
+        'address': address,
+        'symbol': 'TKN',
+        'entry_price': price,
+        'amount': amount,
+        'current_price': price,
+        'entry_time': '2024-01-01T00:00:00',
+    }
+
+
+def make_trade(address='TOKEN', proceeds=0.6, cost=0.5):
+    return {
+        'symbol': 'TKN',
+        'address': address,
+        'entry_price': 0.001,
+        'exit_price': 0.0012,
+        'amount': 500.0,
+        'pnl': proceeds - cost,
+        'pnl_pct': (proceeds - cost) / cost * 100,
+        'reason': 'TAKE PROFIT',
+        'entry_time': '2024-01-01T00:00:00',
+        'exit_time': '2024-01-01T01:00:00',
+    }
+
+
+def write_pending(db_file, action, payload):
+    """Journals an action without applying it, as if the process died right after."""
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "INSERT INTO journal (action, payload, created_at) VALUES (?, ?, '2024-01-01T00:00:00')",
+        (action, payload if isinstance(payload, str) else json.dumps(payload))
+    )
+    conn.commit()
+    conn.close()
+
+
+def journal_statuses(db_file):
+    conn = sqlite3.connect(db_file)
+    rows = conn.execute("SELECT status FROM journal ORDER BY id").fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "trading_bot.db")
+    Database(path)
+    return path
+
+
+def test_pending_deposit_replayed_once(db_file):
+    write_pending(db_file, 'DEPOSIT', {'amount': 2.5})
+
+    db = Database(db_file)
+    assert db.get_balance() == pytest.approx(12.5)
+    assert journal_statuses(db_file) == ['DONE']
+
+    # A second startup must not apply it again
+    db = Database(db_file)
+    assert db.get_balance() == pytest.approx(12.5)
+    assert db.check_consistency()['ok']
+
+
+def test_pending_enter_replayed_once(db_file):
+    write_pending(db_file, 'ENTER', {'position': make_position(), 'cost': 0.5})
+
+    Database(db_file)
+    db = Database(db_file)
+    assert db.get_balance() == pytest.approx(9.5)
+    assert [p['address'] for p in db.get_positions()] == ['TOKEN']
+    assert db.check_consistency()['ok']
+
+
+def test_pending_exit_replayed_once(db_file):
+    db = Database(db_file)
+    db.open_position(make_position(), 0.5)
+    write_pending(db_file, 'EXIT', {'trade': make_trade(), 'proceeds': 0.6})
+
+    Database(db_file)
+    db = Database(db_file)
+    assert db.get_balance() == pytest.approx(10.1)
+    assert db.get_positions() == []
+    assert len(db.get_history()) == 1
+    assert db.check_consistency()['ok']
+
+
+def test_duplicate_enter_marked_failed(db_file):
+    db = Database(db_file)
+    assert db.open_position(make_position(), 0.5)
+    assert not db.open_position(make_position(), 0.5)
+
+    assert journal_statuses(db_file) == ['DONE', 'FAILED']
+    assert db.get_balance() == pytest.approx(9.5)
+    assert db.check_consistency()['ok']
+
+
+def test_new_action_replays_older_pending_first(db_file):
+    db = Database(db_file)
+    # Left PENDING by a lock error earlier in this process, no restart since
+    write_pending(db_file, 'DEPOSIT', {'amount': 2.0})
+    write_pending(db_file, 'ENTER', {'position': make_position(), 'cost': 0.5})
+
+    # The exit only succeeds if the pending entry is applied before it
+    assert db.close_position(make_trade(), 0.6)
+    assert journal_statuses(db_file) == ['DONE', 'DONE', 'DONE']
+    assert db.get_balance() == pytest.approx(12.1)
+    assert db.get_positions() == []
+    assert db.check_consistency()['ok']
+
+    # Nothing left to apply on the next startup
+    assert Database(db_file).get_balance() == pytest.approx(12.1)
+
+
+def test_action_left_pending_by_lock_is_reported(db_file, monkeypatch):
+    db = Database(db_file)
+    real_apply = db.apply_action
+
+    def locked(entry_id):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(db, 'apply_action', locked)
+    assert not db.deposit(1.0)
+    assert journal_statuses(db_file) == ['PENDING']
+
+    # The next action applies it, once, before its own
+    monkeypatch.setattr(db, 'apply_action', real_apply)
+    assert db.deposit(2.0)
+    assert journal_statuses(db_file) == ['DONE', 'DONE']
+    assert db.get_balance() == pytest.approx(13.0)
+
+
+@pytest.mark.parametrize('payload', [{'cost': 0.5}, 'not json', {'position': None, 'cost': 0.5}])
+def test_malformed_entry_does_not_block_startup(db_file, payload):
+    write_pending(db_file, 'ENTER', payload)
+    write_pending(db_file, 'DEPOSIT', {'amount': 1.0})
+
+    db = Database(db_file)
+    assert journal_statuses(db_file) == ['FAILED', 'DONE']
+    assert db.get_balance() == pytest.approx(11.0)
+
+
+def test_consistency_after_enter_and_exit_with_fees(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bot = TradingBot()
+    bot.deposit_sol(1.0)
+
+    pair = {
+        'priceNative': '0.0001',
+        'priceChange': {'m5': 5},
+        'liquidity': {'usd': 5000, 'base': 10000000, 'quote': 15},
+        'baseToken': {'symbol': 'TKN'},
+    }
+    assert bot.enter_position({'tokenAddress': 'TOKEN'}, pair)
+    assert bot.db.check_consistency()['ok']
+
+    # Pump past the take-profit target so update_positions exits
+    exit_pair = dict(pair, priceNative='0.0002')
+    monkeypatch.setattr(bot, 'get_token_details', lambda address: exit_pair)
+    bot.update_positions()
+
+    assert bot.positions == []
+    assert len(bot.history) == 1
+    ledger = bot.db.check_consistency(tolerance=0)
+    assert ledger['ok'], ledger
+    # Fees make the trade worth less than the frictionless 2x
+    assert ledger['realized_pnl'] < bot.trade_amount
+
+
+def test_balance_keeps_full_precision(db_file):
+    db = Database(db_file)
+    expected = db.get_balance()
+    for _ in range(10):
+        db.deposit(0.1)
+        expected += 0.1
+    # Exact: the stored text must round-trip the float, not SQLite's 15 digits
+    assert db.get_balance() == expected
@@ -0,0 +1,85 @@
+import pytest
+
+from database import Database
+from discovery import (
+    SIGNAL_DESCRIPTION, SIGNAL_HEADER, SIGNAL_ICON, SIGNAL_SOCIAL, SIGNAL_WEBSITE,
+    DiscoveryQueue, heuristic_prior, profile_signals,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / "trading_bot.db"))
+
+
+def log_scans(db, signals, total, strong):
+    for i in range(total):
+        db.log_scan({
+            'address': f'{signals}-{i}',
+            'symbol': 'TKN',
+            'icon': None,
+            'liquidity': 5000.0,
+            'score': 80 if i < strong else 10,
+            'strength': 'STRONG' if i < strong else 'WEAK',
+            'time': '2024-01-01T00:00:00',
+            'signals': signals,
+        })
+
+
+def test_profile_signals_links_by_type_or_label():
+    assert profile_signals({}) == 0
+    assert profile_signals({'links': [{'type': 'twitter', 'url': 'x'}]}) == SIGNAL_SOCIAL
+    assert profile_signals({'links': [{'label': 'Website', 'url': 'x'}]}) == SIGNAL_WEBSITE
+    token = {
+        'icon': 'icon.png',
+        'header': 'header.png',
+        'description': 'desc',
+        'links': [{'type': 'telegram'}, {'label': 'Docs'}],
+    }
+    assert profile_signals(token) == (
+        SIGNAL_ICON | SIGNAL_HEADER | SIGNAL_DESCRIPTION | SIGNAL_SOCIAL | SIGNAL_WEBSITE
+    )
+
+
+def test_rank_orders_by_prior_and_trims_to_budget(db):
+    bare = {'tokenAddress': 'bare'}
+    icon = {'tokenAddress': 'icon', 'icon': 'i'}
+    full = {'tokenAddress': 'full', 'icon': 'i', 'header': 'h', 'links': [{'type': 'twitter'}]}
+    queue = DiscoveryQueue(db)
+
+    assert queue.rank([bare, icon, full]) == [full, icon, bare]
+    assert queue.rank([bare, icon, full], budget=2) == [full, icon]
+    # Ties keep API order
+    assert queue.rank([dict(bare, tokenAddress='a'), dict(bare, tokenAddress='b')], budget=1)[0]['tokenAddress'] == 'a'
+
+
+def test_learned_prior_overrides_heuristic(db):
+    log_scans(db, 0, total=100, strong=90)
+    log_scans(db, SIGNAL_ICON | SIGNAL_SOCIAL, total=100, strong=0)
+    queue = DiscoveryQueue(db)
+
+    bare = {'tokenAddress': 'bare'}
+    linked = {'tokenAddress': 'linked', 'icon': 'i', 'links': [{'type': 'twitter'}]}
+    assert heuristic_prior(SIGNAL_ICON | SIGNAL_SOCIAL) > heuristic_prior(0)
+    assert queue.rank([linked, bare], budget=1) == [bare]
+    assert queue.prior(0) == pytest.approx((90 + 10 * heuristic_prior(0)) / 110)
+
+
+def test_pre_migration_scans_are_ignored(db):
+    log_scans(db, None, total=100, strong=90)
+    assert db.get_signal_stats() == []
+
+
+def test_priors_cached_between_batches(db, monkeypatch):
+    queue = DiscoveryQueue(db, refresh_interval=60)
+    calls = []
+    original = db.get_signal_stats
+    monkeypatch.setattr(db, 'get_signal_stats', lambda: calls.append(1) or original())
+
+    for _ in range(5):
+        queue.rank([{'tokenAddress': 'a'}])
+    assert len(calls) == 1
+
+    queue.refreshed_at -= 60
+    queue.rank([{'tokenAddress': 'a'}])
+    assert len(calls) == 2
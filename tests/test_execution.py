@@ -0,0 +1,77 @@
+import pytest
+
+from execution import ExecutionSimulator
+
+BASE = 10000000.0  # Token reserve
+QUOTE = 1000.0     # SOL reserve
+
+
+def make_pair(price=QUOTE / BASE, change_m5=0, **liquidity):
+    return {
+        'priceNative': str(price),
+        'priceUsd': str(price * 150),
+        'priceChange': {'m5': change_m5},
+        'liquidity': liquidity or {'usd': QUOTE * 150 * 2, 'base': BASE, 'quote': QUOTE},
+    }
+
+
+def test_frictionless_fills_match_constant_product():
+    executor = ExecutionSimulator(swap_fee=0, priority_fee=0, latency_ms=0)
+    pair = make_pair()
+
+    tokens, cost = executor.simulate_buy(pair, 10.0)
+    assert tokens == pytest.approx(BASE * 10.0 / (QUOTE + 10.0), rel=1e-12)
+    assert cost == 10.0
+
+    proceeds = executor.simulate_sell(pair, 50000.0)
+    assert proceeds == pytest.approx(QUOTE * 50000.0 / (BASE + 50000.0), rel=1e-12)
+
+
+def test_round_trip_loses_to_fees_and_impact():
+    executor = ExecutionSimulator(latency_ms=0)
+    pair = make_pair()
+
+    tokens, cost = executor.simulate_buy(pair, 10.0)
+    proceeds = executor.simulate_sell(pair, tokens)
+    assert proceeds < cost
+    # Impact alone must cost more than the fees
+    assert proceeds < 10.0 * (1 - executor.swap_fee) ** 2 - 2 * executor.priority_fee
+
+
+def test_reserves_fall_back_to_usd_liquidity():
+    pair = make_pair(usd=300000)
+    base, quote = ExecutionSimulator.reserves(pair)
+    # Half the USD on each side, converted at priceUsd and priceNative
+    assert base == pytest.approx(150000 / (QUOTE / BASE * 150))
+    assert quote == pytest.approx(base * QUOTE / BASE)
+
+
+def test_reserves_unknown_without_liquidity():
+    pair = make_pair(usd=0)
+    assert ExecutionSimulator.reserves(pair) == (0.0, 0.0)
+
+    # Without reserves the fill has no price impact, only fees
+    executor = ExecutionSimulator(swap_fee=0, priority_fee=0, latency_ms=0)
+    tokens, _ = executor.simulate_buy(pair, 10.0)
+    assert tokens == pytest.approx(10.0 / (QUOTE / BASE))
+
+
+@pytest.mark.parametrize('price, amount', [(0, 10.0), (-1, 10.0), (QUOTE / BASE, 0), (QUOTE / BASE, -1)])
+def test_guards_return_empty_fills(price, amount):
+    executor = ExecutionSimulator()
+    pair = make_pair(price=price)
+    assert executor.simulate_buy(pair, amount) == (0.0, 0.0)
+    assert executor.simulate_sell(pair, amount) == 0.0
+
+
+@pytest.mark.parametrize('change_m5, direction', [(10, 1), (-10, -1), (0, 0)])
+def test_latency_drifts_with_m5_trend(change_m5, direction):
+    pair = make_pair(change_m5=change_m5)
+    spot = float(pair['priceNative'])
+
+    drifted = ExecutionSimulator(latency_ms=3000).fill_price(pair)
+    assert (drifted > spot) - (drifted < spot) == direction
+    # 3s of a 10% per 5m trend
+    assert drifted == pytest.approx(spot * (1 + change_m5 / 100 * 3000 / 300000))
+
+    assert ExecutionSimulator(latency_ms=0).fill_price(pair) == spot